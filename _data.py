@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from cases_io import load_cases
+
+# Column arrays of the public cases, shared by the analysis scripts
+DAYS, MILES, RECEIPTS, Y = load_cases()
+
+# One parsed copy is shared by every importer, so keep it read-only
+for _column in (DAYS, MILES, RECEIPTS, Y):
+    _column.flags.writeable = False
+
+def tier_eval(x, brks, rates):
+    """Apply tiered rates to x, where tier i covers brks[i] to brks[i+1]"""
+    in_tier = np.clip(x[..., None], brks[:-1], brks[1:]) - brks[:-1]
+    return in_tier @ rates
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+
+from numba import njit, prange
+
+import calculate_reimbursement
+
+# Compiled here rather than in calculate_reimbursement, so only batch scoring
+# loads numba and the single-case CLI stays plain Python
+_calc_core = njit(cache=True)(calculate_reimbursement._calc_core)
+
+@njit(cache=True, parallel=True)
+def batch_totals(days_arr, miles_arr, receipts_arr, out, base_rate, receipt_multipliers, mile_rate):
+    """Unrounded reimbursement of every case, written into out"""
+    for i in prange(len(days_arr)):
+        out[i] = _calc_core(days_arr[i], miles_arr[i], receipts_arr[i], base_rate, receipt_multipliers, mile_rate)
+    return out
@@ -1,29 +1,77 @@
 #!/usr/bin/env python3
 
-import json
 import pandas as pd
 import numpy as np
 from collections import defaultdict
 import statistics
+from cases_io import load_cases
+
+def closed_bins(breaks):
+    """
+    Right-closed bins over breaks whose first bin also holds the lowest edge,
+    built and labelled the same way as pd.cut(..., include_lowest=True)
+    """
+    breaks = np.array(breaks, dtype=np.float64)
+    breaks[0] -= 0.001
+    return pd.IntervalIndex.from_breaks(breaks)
+
+# Bin edges for the mileage and efficiency breakdowns
+IVL_MILE = closed_bins([0, 50, 100, 200, 300, 500, 1000, 2000])
+IVL_EFFICIENCY = closed_bins([0, 50, 100, 150, 200, 250, 300, 500])
 
 # Load the data
-with open('public_cases.json', 'r') as f:
-    cases = json.load(f)
+days, miles, receipts, reimbursement = load_cases()
 
 # Convert to pandas DataFrame for easier analysis
-data = []
-for case in cases:
-    inp = case['input']
-    out = case['expected_output']
-    data.append({
-        'days': inp['trip_duration_days'],
-        'miles': inp['miles_traveled'],
-        'receipts': inp['total_receipts_amount'],
-        'reimbursement': out
-    })
+data = {
+    'days': days,
+    'miles': miles,
+    'receipts': receipts,
+    'reimbursement': reimbursement
+}
 
 df = pd.DataFrame(data)
 
+def _grouped_moments(groups, values, ngroups):
+    """Per-group count, sum, sum of squares, min and max using bincount"""
+    count = np.bincount(groups, minlength=ngroups)
+    total = np.bincount(groups, weights=values, minlength=ngroups)
+    total_sq = np.bincount(groups, weights=values * values, minlength=ngroups)
+    low = np.full(ngroups, np.inf)
+    high = np.full(ngroups, -np.inf)
+    np.minimum.at(low, groups, values)
+    np.maximum.at(high, groups, values)
+    return count, total, total_sq, low, high
+
+def grouped_stats(groups, values, ngroups):
+    """Per-group count, mean, sample std, min and max of values"""
+    count, total, total_sq, low, high = _grouped_moments(groups, values, ngroups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+        # ddof=1 to match pandas' std
+        std = np.sqrt(np.maximum(total_sq - count * mean * mean, 0) / (count - 1))
+    return {'count': count, 'mean': mean, 'std': std, 'min': low, 'max': high}
+
+# Derive all per-row columns in one pass over the underlying arrays
+d = df['days'].to_numpy()
+m = df['miles'].to_numpy()
+r = df['receipts'].to_numpy()
+o = df['reimbursement'].to_numpy()
+per_day_rate = o / d
+miles_per_day = m / d
+base_estimate = d * 100  # Assume $100 base per day
+remaining_after_base = o - base_estimate
+simple_mask = (r < 25) & (m < 100)
+df = df.assign(
+    per_day_rate=per_day_rate,
+    miles_per_day=miles_per_day,
+    base_estimate=base_estimate,
+    remaining_after_base=remaining_after_base,
+    apparent_mile_rate=np.where(m > 0, remaining_after_base / m, 0),
+    mile_bin=pd.cut(m, IVL_MILE),
+    efficiency_bin=pd.cut(miles_per_day, IVL_EFFICIENCY)
+)
+
 print("=== BASIC STATISTICS ===")
 print(f"Total cases: {len(df)}")
 print(f"Days range: {df['days'].min()} - {df['days'].max()}")
@@ -32,28 +80,45 @@ print(f"Receipts range: ${df['receipts'].min():.2f} - ${df['receipts'].max():.2f
 print(f"Reimbursement range: ${df['reimbursement'].min():.2f} - ${df['reimbursement'].max():.2f}")
 print()
 
-# Analyze patterns by trip duration
-print("=== ANALYSIS BY TRIP DURATION ===")
-by_days = df.groupby('days').agg({
+# Analyze patterns by trip duration, along with per-day reimbursement rates.
+# days is a small non-negative integer, so each statistic is a bincount
+n_days = int(d.max()) + 1
+day_stats = {
+    'reimbursement': grouped_stats(d, o, n_days),
+    'miles': grouped_stats(d, m, n_days),
+    'receipts': grouped_stats(d, r, n_days),
+    'per_day_rate': grouped_stats(d, per_day_rate, n_days),
+    'simple_per_day_rate': grouped_stats(d[simple_mask], per_day_rate[simple_mask], n_days)
+}
+day_columns = {
     'reimbursement': ['count', 'mean', 'std', 'min', 'max'],
-    'miles': 'mean',
-    'receipts': 'mean'
-}).round(2)
+    'miles': ['mean'],
+    'receipts': ['mean'],
+    'per_day_rate': ['mean', 'std', 'min', 'max'],
+    'simple_per_day_rate': ['count', 'mean', 'std']
+}
+by_days_all = pd.DataFrame(
+    {(col, stat): day_stats[col][stat] for col, stats in day_columns.items() for stat in stats},
+    index=pd.Index(np.arange(n_days), name='days')
+)
+by_days_all = by_days_all[day_stats['reimbursement']['count'] > 0].round(2)
+
+print("=== ANALYSIS BY TRIP DURATION ===")
+by_days = by_days_all[['reimbursement', 'miles', 'receipts']]
 print(by_days)
 print()
 
 # Look at per-day reimbursement rates
 print("=== PER-DAY REIMBURSEMENT RATES ===")
-df['per_day_rate'] = df['reimbursement'] / df['days']
-by_days_rate = df.groupby('days')['per_day_rate'].agg(['mean', 'std', 'min', 'max']).round(2)
+by_days_rate = by_days_all['per_day_rate']
 print(by_days_rate)
 print()
 
 # Analyze simple cases (low receipts, low miles) to find base per diem
 print("=== BASE PER DIEM ANALYSIS (Low receipts < $25, Low miles < 100) ===")
-simple_cases = df[(df['receipts'] < 25) & (df['miles'] < 100)]
-if len(simple_cases) > 0:
-    simple_rate = simple_cases.groupby('days')['per_day_rate'].agg(['count', 'mean', 'std']).round(2)
+simple_rate = by_days_all['simple_per_day_rate']
+simple_rate = simple_rate[simple_rate['count'] > 0]
+if len(simple_rate) > 0:
     print(simple_rate)
     print()
 
@@ -72,15 +137,7 @@ if len(five_day) > 0 and len(four_day) > 0:
 
 # Analyze mileage patterns
 print("=== MILEAGE ANALYSIS ===")
-# Calculate apparent mileage rate
-df['miles_per_day'] = df['miles'] / df['days']
-df['base_estimate'] = df['days'] * 100  # Assume $100 base per day
-df['remaining_after_base'] = df['reimbursement'] - df['base_estimate']
-df['apparent_mile_rate'] = np.where(df['miles'] > 0, df['remaining_after_base'] / df['miles'], 0)
-
-# Look at mileage rates by mile ranges
-mile_bins = [0, 50, 100, 200, 300, 500, 1000, 2000]
-df['mile_bin'] = pd.cut(df['miles'], bins=mile_bins, include_lowest=True)
+# Look at apparent mileage rates by mile ranges
 mile_analysis = df.groupby('mile_bin')['apparent_mile_rate'].agg(['count', 'mean', 'std']).round(3)
 print("Apparent mileage rates by mile range:")
 print(mile_analysis)
@@ -88,8 +145,6 @@ print()
 
 # Look for efficiency bonuses (high miles per day)
 print("=== EFFICIENCY ANALYSIS (Miles per day) ===")
-efficiency_bins = [0, 50, 100, 150, 200, 250, 300, 500]
-df['efficiency_bin'] = pd.cut(df['miles_per_day'], bins=efficiency_bins, include_lowest=True)
 efficiency_analysis = df.groupby('efficiency_bin')['per_day_rate'].agg(['count', 'mean', 'std']).round(2)
 print("Per-day rates by miles-per-day efficiency:")
 print(efficiency_analysis)
@@ -121,15 +176,15 @@ print()
 print("=== SAMPLE CASES FOR PATTERN RECOGNITION ===")
 print("1-day, low miles, low receipts:")
 sample1 = df[(df['days'] == 1) & (df['miles'] < 100) & (df['receipts'] < 20)].head(5)
-for _, row in sample1.iterrows():
-    print(f"  {row['days']}d, {row['miles']}mi, ${row['receipts']:.2f} → ${row['reimbursement']:.2f}")
+for d, m, r, o in sample1[['days', 'miles', 'receipts', 'reimbursement']].itertuples(index=False, name=None):
+    print(f"  {d}d, {m}mi, ${r:.2f} → ${o:.2f}")
 
 print("\n5-day cases:")
 sample5 = df[df['days'] == 5].head(5)
-for _, row in sample5.iterrows():
-    print(f"  {row['days']}d, {row['miles']}mi, ${row['receipts']:.2f} → ${row['reimbursement']:.2f}")
+for d, m, r, o in sample5[['days', 'miles', 'receipts', 'reimbursement']].itertuples(index=False, name=None):
+    print(f"  {d}d, {m}mi, ${r:.2f} → ${o:.2f}")
 
 print("\nHigh efficiency cases (>300 miles/day):")
 high_eff = df[df['miles_per_day'] > 300].head(5)
-for _, row in high_eff.iterrows():
-    print(f"  {row['days']}d, {row['miles']}mi ({row['miles_per_day']:.1f}/day), ${row['receipts']:.2f} → ${row['reimbursement']:.2f}") 
\ No newline at end of file
+for d, m, mpd, r, o in high_eff[['days', 'miles', 'miles_per_day', 'receipts', 'reimbursement']].itertuples(index=False, name=None):
+    print(f"  {d}d, {m}mi ({mpd:.1f}/day), ${r:.2f} → ${o:.2f}") 
\ No newline at end of file
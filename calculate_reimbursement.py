@@ -1,14 +1,39 @@
 #!/usr/bin/env python3
 
 import sys
+import json
 import math
 
+def load_base_coeffs(path='coeffs.json'):
+    """
+    Load the best linear combination saved by pattern_finder.py, falling
+    back to the one found by the original analysis.
+    """
+    default = (75, 0.50, 0.50)
+    try:
+        with open(path, 'r') as f:
+            coeffs = json.load(f)
+        values = (coeffs['base_rate'], coeffs['receipt_mult'], coeffs['mile_rate'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return default
+    
+    # Only finite plain numbers are usable as coefficients (not null, strings or bools)
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in values):
+        return default
+    return values
+
+BASE_RATE, RECEIPT_MULT, MILE_RATE = load_base_coeffs()
+
+# Receipt multiplier by receipts-per-day tier: < $50, $50-150, $150-300, > $300
+RECEIPT_MULTIPLIERS = tuple(max(RECEIPT_MULT + offset, 0.0) for offset in (0.1, 0.0, -0.1, -0.3))
+
 def calculate_reimbursement(days, miles, receipts):
     """
     Calculate reimbursement using the best linear combination discovered.
     
     From my analysis, the best performing simple formula was:
     $75 * days + 0.50 * receipts + 0.50 * miles
+    (or whatever pattern_finder.py last saved to coeffs.json)
     
     But with some adjustments for edge cases.
     """
@@ -18,48 +43,43 @@ def calculate_reimbursement(days, miles, receipts):
     miles = float(miles)
     receipts = float(receipts)
     
+    return round(_calc_core(days, miles, receipts, BASE_RATE, RECEIPT_MULTIPLIERS, MILE_RATE), 2)
+
+# Plain Python so the single-case CLI never imports numba; _reimbursement_batch
+# compiles it for calc_batch. The base coefficients are passed in rather than
+# read as globals: numba freezes globals at compile time and its on-disk cache
+# would keep them stale.
+def _calc_core(days, miles, receipts, base_rate, receipt_multipliers, mile_rate):
+    """Numeric core of calculate_reimbursement, returns the unrounded total"""
+    
     # Base formula from analysis: the best linear combination I found
-    base_calculation = 75 * days + 0.50 * receipts + 0.50 * miles
+    base_calculation = base_rate * days + receipt_multipliers[1] * receipts + mile_rate * miles
     
     # Adjustments based on patterns observed
     
+    # Every piecewise rule below is written with min/max and comparison
+    # arithmetic instead of if/elif so the compiled code is branch-free
+    safe_days = max(days, 1)
+    
     # 1. Efficiency bonus for high miles per day
-    miles_per_day = miles / days if days > 0 else 0
-    efficiency_bonus = 0
-    if miles_per_day > 100:
-        efficiency_bonus = (miles_per_day - 100) * 0.3
+    miles_per_day = (days > 0) * miles / safe_days
+    efficiency_bonus = max(miles_per_day - 100, 0) * 0.3
     
     # 2. Receipt processing adjustments
-    receipt_multiplier = 0.5  # Base multiplier
-    
-    # Adjust receipt multiplier based on receipt amount and trip length
-    receipts_per_day = receipts / days if days > 0 else 0
-    
-    if receipts_per_day > 300:
-        # High spending per day - reduce receipt multiplier
-        receipt_multiplier = 0.2
-    elif receipts_per_day > 150:
-        receipt_multiplier = 0.4
-    elif receipts_per_day < 50:
-        # Low spending - slightly better multiplier
-        receipt_multiplier = 0.6
+    # Adjust receipt multiplier based on receipt amount and trip length:
+    # low spending (< $50/day) gets a slightly better multiplier, high
+    # spending (> $150/day, > $300/day) gets a reduced one
+    receipts_per_day = (days > 0) * receipts / safe_days
+    receipt_tier = int(receipts_per_day >= 50) + int(receipts_per_day > 150) + int(receipts_per_day > 300)
+    receipt_multiplier = receipt_multipliers[receipt_tier]
     
     # 3. Trip length adjustments
-    days_multiplier = 75  # Base per day
-    
-    if days == 1:
-        days_multiplier = 90  # 1-day trips get slight bonus
-    elif days > 10:
-        days_multiplier = 65  # Very long trips get reduced per-day rate
+    # 1-day trips get slight bonus, very long trips get reduced per-day rate
+    days_multiplier = base_rate + 15 * (days == 1) - 10 * (days > 10)
     
     # 4. Mileage adjustments
-    miles_multiplier = 0.5  # Base mileage rate
-    
-    if miles > 500:
-        # High mileage gets reduced rate for excess
-        miles_component = 500 * 0.5 + (miles - 500) * 0.3
-    else:
-        miles_component = miles * miles_multiplier
+    # High mileage gets reduced rate for excess over 500 miles
+    miles_component = min(miles, 500) * mile_rate + max(miles - 500, 0) * 0.3
     
     # Calculate final amount
     total = (days_multiplier * days + 
@@ -75,7 +95,25 @@ def calculate_reimbursement(days, miles, receipts):
     reasonable_max = days * 300 + receipts * 1.5 + miles * 2
     total = min(total, reasonable_max)
     
-    return round(total, 2)
+    return total
+
+def calc_batch(days_arr, miles_arr, receipts_arr, out):
+    """Score many cases at once, writing each reimbursement into out"""
+    try:
+        # numba only pays off for a batch, so it is imported here rather
+        # than at the top, where every run.sh call would load it
+        from _reimbursement_batch import batch_totals
+    except ImportError:
+        for i in range(len(days_arr)):
+            out[i] = _calc_core(int(days_arr[i]), float(miles_arr[i]), float(receipts_arr[i]),
+                                BASE_RATE, RECEIPT_MULTIPLIERS, MILE_RATE)
+    else:
+        batch_totals(days_arr, miles_arr, receipts_arr, out, BASE_RATE, RECEIPT_MULTIPLIERS, MILE_RATE)
+    
+    # Round with the same round(total, 2) as calculate_reimbursement, so a
+    # batch score always matches what run.sh prints
+    out[:] = [round(total, 2) for total in out.tolist()]
+    return out
 
 if __name__ == "__main__":
     if len(sys.argv) != 4:
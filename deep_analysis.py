@@ -1,11 +1,9 @@
 #!/usr/bin/env python3
 
-import json
 import math
+import numpy as np
 
-# Load the data
-with open('public_cases.json', 'r') as f:
-    cases = json.load(f)
+from _data import DAYS, MILES, RECEIPTS, Y
 
 def find_simple_mathematical_relationships():
     """Look for simple mathematical patterns that might explain the data"""
@@ -15,24 +13,11 @@ def find_simple_mathematical_relationships():
     # reimbursement = a*days + b*miles + c*receipts + d
     
     # Use least squares to find best coefficients
-    import numpy as np
     
     # Prepare data matrices
-    X = []
-    y = []
-    
-    for case in cases:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        reimbursement = case['expected_output']
-        
-        # Add features: days, miles, receipts, constant term
-        X.append([days, miles, receipts, 1])
-        y.append(reimbursement)
-    
-    X = np.array(X)
-    y = np.array(y)
+    # Add features: days, miles, receipts, constant term
+    X = np.column_stack([DAYS, MILES, RECEIPTS, np.ones(len(DAYS))])
+    y = Y
     
     # Solve for coefficients using least squares
     coeffs = np.linalg.lstsq(X, y, rcond=None)[0]
@@ -40,18 +25,8 @@ def find_simple_mathematical_relationships():
     print(f"Best linear fit: {coeffs[0]:.2f}*days + {coeffs[1]:.3f}*miles + {coeffs[2]:.3f}*receipts + {coeffs[3]:.2f}")
     
     # Test accuracy
-    total_error = 0
-    for i, case in enumerate(cases[:100]):
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        expected = case['expected_output']
-        
-        predicted = coeffs[0]*days + coeffs[1]*miles + coeffs[2]*receipts + coeffs[3]
-        error = abs(predicted - expected)
-        total_error += error
-    
-    avg_error = total_error / 100
+    predicted = X[:100] @ coeffs
+    avg_error = np.abs(predicted - y[:100]).mean()
     print(f"Average error on first 100 cases: ${avg_error:.2f}")
     
     return coeffs
@@ -60,32 +35,28 @@ def test_polynomial_relationships():
     """Test if there are polynomial relationships"""
     print("\n=== TESTING POLYNOMIAL RELATIONSHIPS ===")
     
-    import numpy as np
-    
-    # Test quadratic terms
-    X = []
-    y = []
-    
-    for case in cases[:500]:  # Use subset for faster computation
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        reimbursement = case['expected_output']
-        
+    def quadratic_features(days, miles, receipts):
         # Features: days, miles, receipts, days^2, miles^2, receipts^2, days*miles, etc.
-        X.append([
+        return np.column_stack([
             days, miles, receipts,
-            days**2, miles**2, receipts**2,
+            days*days, miles*miles, receipts*receipts,
             days*miles, days*receipts, miles*receipts,
-            1  # constant term
+            np.ones(len(days))  # constant term
         ])
-        y.append(reimbursement)
-    
-    X = np.array(X)
-    y = np.array(y)
     
-    # Solve for coefficients
-    coeffs = np.linalg.lstsq(X, y, rcond=None)[0]
+    # Test quadratic terms
+    train = slice(0, 500)  # Use subset for faster computation
+    X = quadratic_features(DAYS[train], MILES[train], RECEIPTS[train])
+    y = Y[train]
+    
+    # Solve for coefficients via the normal equations; scaling every column
+    # to unit norm first keeps X.T @ X well conditioned despite receipts^2
+    scale = np.linalg.norm(X, axis=0)
+    Xs = X / scale
+    try:
+        coeffs = np.linalg.solve(Xs.T @ Xs, Xs.T @ y) / scale
+    except np.linalg.LinAlgError:
+        coeffs = np.linalg.lstsq(X, y, rcond=None)[0]
     
     print("Polynomial coefficients:")
     feature_names = ['days', 'miles', 'receipts', 'days^2', 'miles^2', 'receipts^2', 
@@ -96,27 +67,10 @@ def test_polynomial_relationships():
             print(f"  {name}: {coeffs[i]:.4f}")
     
     # Test accuracy
-    total_error = 0
-    test_cases = cases[500:600]  # Use different data for testing
-    
-    for case in test_cases:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        expected = case['expected_output']
-        
-        features = [
-            days, miles, receipts,
-            days**2, miles**2, receipts**2,
-            days*miles, days*receipts, miles*receipts,
-            1
-        ]
-        
-        predicted = sum(coeffs[i] * features[i] for i in range(len(features)))
-        error = abs(predicted - expected)
-        total_error += error
+    test = slice(500, 600)  # Use different data for testing
+    predicted = quadratic_features(DAYS[test], MILES[test], RECEIPTS[test]) @ coeffs
     
-    avg_error = total_error / len(test_cases)
+    avg_error = np.abs(predicted - Y[test]).mean()
     print(f"Average error on test cases: ${avg_error:.2f}")
     
     return coeffs
@@ -125,76 +79,43 @@ def analyze_ratio_patterns():
     """Look for patterns in ratios"""
     print("\n=== ANALYZING RATIO PATTERNS ===")
     
-    ratios = []
-    for case in cases[:200]:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        reimbursement = case['expected_output']
-        
-        # Calculate various ratios
-        per_day = reimbursement / days
-        per_mile = reimbursement / miles if miles > 0 else 0
-        per_receipt_dollar = reimbursement / receipts if receipts > 0 else 0
-        
-        ratios.append({
-            'days': days,
-            'miles': miles,
-            'receipts': receipts,
-            'reimbursement': reimbursement,
-            'per_day': per_day,
-            'per_mile': per_mile,
-            'per_receipt_dollar': per_receipt_dollar,
-            'miles_per_day': miles/days,
-            'receipts_per_day': receipts/days
-        })
+    days, miles, receipts, reimbursement = DAYS[:200], MILES[:200], RECEIPTS[:200], Y[:200]
+    per_day = reimbursement / days
+    
+    def show(indices):
+        for i in indices:
+            print(f"  {days[i]}d, {miles[i]:.0f}mi, ${receipts[i]:.2f} → ${reimbursement[i]:.2f} (${per_day[i]:.2f}/day)")
+    
+    # Only the 10 extremes are needed, so partition instead of sorting everything
+    top = np.sort(np.argpartition(-per_day, 10)[:10])
+    bottom = np.sort(np.argpartition(per_day, 10)[:10])
     
     # Look for cases with similar ratios
     print("Cases with highest per-day rates:")
-    sorted_by_per_day = sorted(ratios, key=lambda x: x['per_day'], reverse=True)
-    for r in sorted_by_per_day[:10]:
-        print(f"  {r['days']}d, {r['miles']:.0f}mi, ${r['receipts']:.2f} → ${r['reimbursement']:.2f} (${r['per_day']:.2f}/day)")
+    show(top[np.argsort(-per_day[top], kind='stable')])
     
     print("\nCases with lowest per-day rates:")
-    for r in sorted_by_per_day[-10:]:
-        print(f"  {r['days']}d, {r['miles']:.0f}mi, ${r['receipts']:.2f} → ${r['reimbursement']:.2f} (${r['per_day']:.2f}/day)")
+    show(bottom[np.argsort(-per_day[bottom], kind='stable')])
 
 def look_for_discrete_rules():
     """Look for discrete thresholds or rules"""
     print("\n=== LOOKING FOR DISCRETE RULES ===")
     
-    # Group by ranges and look for patterns
-    by_days = {}
-    for case in cases:
-        days = case['input']['trip_duration_days']
-        if days not in by_days:
-            by_days[days] = []
-        by_days[days].append(case)
-    
     # Look at each day length separately
-    for days in sorted(by_days.keys())[:5]:  # First 5 day lengths
-        cases_for_days = by_days[days]
-        print(f"\n{days}-day trips ({len(cases_for_days)} cases):")
+    for days in np.unique(DAYS)[:5]:  # First 5 day lengths
+        in_group = DAYS == days
+        print(f"\n{days}-day trips ({np.count_nonzero(in_group)} cases):")
         
         # Look for simple relationships
-        simple_cases = [c for c in cases_for_days if c['input']['receipts'] < 100 and c['input']['miles'] < 200]
-        if simple_cases:
+        simple_cases = np.flatnonzero(in_group & (RECEIPTS < 100) & (MILES < 200))
+        if len(simple_cases) > 0:
             print(f"  Simple cases (low receipts & miles):")
-            for case in simple_cases[:5]:
-                r = case['expected_output']
-                m = case['input']['miles']
-                rec = case['input']['total_receipts_amount']
-                print(f"    {m:.0f}mi, ${rec:.2f} → ${r:.2f}")
+            for i in simple_cases[:5]:
+                print(f"    {MILES[i]:.0f}mi, ${RECEIPTS[i]:.2f} → ${Y[i]:.2f}")
 
 if __name__ == "__main__":
-    try:
-        import numpy as np
-        coeffs = find_simple_mathematical_relationships()
-        poly_coeffs = test_polynomial_relationships()
-    except ImportError:
-        print("NumPy not available, skipping mathematical optimization")
-        coeffs = None
-        poly_coeffs = None
+    coeffs = find_simple_mathematical_relationships()
+    poly_coeffs = test_polynomial_relationships()
     
     analyze_ratio_patterns()
     look_for_discrete_rules() 
\ No newline at end of file
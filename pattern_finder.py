@@ -2,41 +2,37 @@
 
 import json
 import math
+import numpy as np
+from _data import DAYS, MILES, RECEIPTS, Y, tier_eval
 
-# Load the data
-with open('public_cases.json', 'r') as f:
-    cases = json.load(f)
+# Tier breakpoints and rates for the current best formula
+RECEIPT_BRKS = np.array([0, 100, 500, np.inf])
+RECEIPT_RATES = np.array([0.8, 0.6, 0.4])
+MILE_BRKS = np.array([0, 100, 300, np.inf])
+MILE_RATES = np.array([1.0, 0.8, 0.6])
 
 def find_best_linear_combination():
     """Try various linear combinations to find the best fit"""
     print("=== FINDING BEST LINEAR COMBINATION ===")
     
-    best_error = float('inf')
-    best_formula = None
-    
-    # Test different base rates per day
-    for base_rate in range(50, 200, 25):
-        # Test different receipt multipliers
-        for receipt_mult in [0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]:
-            # Test with and without mileage component
-            for mile_rate in [0, 0.25, 0.5, 0.75, 1.0]:
-                total_error = 0
-                test_cases = cases[:100]  # Use more cases for better accuracy
-                
-                for case in test_cases:
-                    days = case['input']['trip_duration_days']
-                    miles = case['input']['miles_traveled']
-                    receipts = case['input']['total_receipts_amount']
-                    expected = case['expected_output']
-                    
-                    predicted = base_rate * days + receipt_mult * receipts + mile_rate * miles
-                    error = abs(predicted - expected)
-                    total_error += error
-                
-                avg_error = total_error / len(test_cases)
-                if avg_error < best_error:
-                    best_error = avg_error
-                    best_formula = (base_rate, receipt_mult, mile_rate)
+    # Candidate base rates per day, receipt multipliers and mileage rates
+    base_rates = np.arange(50, 200, 25)
+    receipt_mults = np.array([0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+    mile_rates = np.array([0, 0.25, 0.5, 0.75, 1.0])
+    
+    # Use more cases for better accuracy
+    d, m, r, y = DAYS[:100], MILES[:100], RECEIPTS[:100], Y[:100]
+    
+    # Evaluate every (base_rate, receipt_mult, mile_rate) triple at once:
+    # predictions have shape (bases, receipt mults, mile rates, cases)
+    predicted = (base_rates[:, None, None, None] * d
+                 + receipt_mults[None, :, None, None] * r
+                 + mile_rates[None, None, :, None] * m)
+    avg_errors = np.abs(predicted - y).mean(axis=-1)
+    
+    bi, ri, mi = np.unravel_index(np.argmin(avg_errors), avg_errors.shape)
+    best_error = avg_errors[bi, ri, mi]
+    best_formula = (int(base_rates[bi]), float(receipt_mults[ri]), float(mile_rates[mi]))
     
     base_rate, receipt_mult, mile_rate = best_formula
     print(f"Best linear formula: ${base_rate} * days + {receipt_mult:.2f} * receipts + {mile_rate:.2f} * miles")
@@ -139,19 +135,15 @@ def test_progressive_formulas():
         ("With receipt tiers", formula_v5),
     ]
     
-    test_cases = cases[:100]
+    n_test = 100
+    test_cases = list(zip(DAYS[:n_test], MILES[:n_test], RECEIPTS[:n_test], Y[:n_test]))
     
     for name, formula_func in formulas:
         total_error = 0
         within_10 = 0
         within_25 = 0
         
-        for case in test_cases:
-            days = case['input']['trip_duration_days']
-            miles = case['input']['miles_traveled']
-            receipts = case['input']['total_receipts_amount']
-            expected = case['expected_output']
-            
+        for days, miles, receipts, expected in test_cases:
             predicted = formula_func(days, miles, receipts)
             error = abs(predicted - expected)
             total_error += error
@@ -169,61 +161,41 @@ def analyze_outliers_carefully():
     print("\n=== ANALYZING OUTLIERS ===")
     
     def current_best_formula(days, miles, receipts):
-        """Current best guess formula"""
-        if days == 1:
-            base_per_day = 110
-        elif days <= 3:
-            base_per_day = 120
-        elif days <= 5:
-            base_per_day = 100
-        else:
-            base_per_day = 95
+        """Current best guess formula, on arrays of cases"""
+        base_per_day = np.where(days == 1, 110,
+                                np.where(days <= 3, 120,
+                                         np.where(days <= 5, 100, 95)))
         
         base = base_per_day * days
         
         # Tiered receipt processing
-        if receipts <= 100:
-            receipt_component = receipts * 0.8
-        elif receipts <= 500:
-            receipt_component = 100 * 0.8 + (receipts - 100) * 0.6
-        else:
-            receipt_component = 100 * 0.8 + 400 * 0.6 + (receipts - 500) * 0.4
+        receipt_component = tier_eval(receipts, RECEIPT_BRKS, RECEIPT_RATES)
         
         # Tiered mileage
-        if miles <= 100:
-            mileage_component = miles * 1.0
-        elif miles <= 300:
-            mileage_component = 100 * 1.0 + (miles - 100) * 0.8
-        else:
-            mileage_component = 100 * 1.0 + 200 * 0.8 + (miles - 300) * 0.6
+        mileage_component = tier_eval(miles, MILE_BRKS, MILE_RATES)
         
         return base + receipt_component + mileage_component
     
     # Find cases with biggest errors
-    errors = []
-    for case in cases[:200]:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        expected = case['expected_output']
-        
-        predicted = current_best_formula(days, miles, receipts)
-        error = abs(predicted - expected)
-        errors.append((error, case, predicted))
+    days, miles, receipts, expected = DAYS[:200], MILES[:200], RECEIPTS[:200], Y[:200]
+    predicted = current_best_formula(days, miles, receipts)
+    errors = np.abs(predicted - expected)
     
-    # Sort by error and look at worst cases
-    errors.sort(reverse=True)
+    # Look at the worst cases; only 15 are needed, so partition rather than sort
+    worst = np.argpartition(-errors, 15)[:15]
+    worst = worst[np.argsort(-errors[worst])]
     
     print("Worst prediction errors:")
-    for error, case, predicted in errors[:15]:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        expected = case['expected_output']
-        
-        print(f"{days}d, {miles}mi, ${receipts:.2f} → Expected: ${expected:.2f}, Predicted: ${predicted:.2f}, Error: ${error:.2f}")
+    for i in worst:
+        print(f"{days[i]}d, {miles[i]:g}mi, ${receipts[i]:.2f} → Expected: ${expected[i]:.2f}, Predicted: ${predicted[i]:.2f}, Error: ${errors[i]:.2f}")
 
 if __name__ == "__main__":
     best_formula = find_best_linear_combination()
+    
+    # Save the fit so calculate_reimbursement.py picks it up
+    base_rate, receipt_mult, mile_rate = best_formula
+    with open('coeffs.json', 'w') as f:
+        json.dump({'base_rate': base_rate, 'receipt_mult': receipt_mult, 'mile_rate': mile_rate}, f)
+    
     test_progressive_formulas()
     analyze_outliers_carefully() 
\ No newline at end of file
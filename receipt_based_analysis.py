@@ -1,154 +1,215 @@
 #!/usr/bin/env python3
 
-import json
+import io
+import sys
 import math
+import numpy as np
+from cases_io import load_cases
 
-# Load the data
-with open('public_cases.json', 'r') as f:
-    cases = json.load(f)
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba not available, fall back to plain Python
+    def njit(*signature, **options):
+        return lambda func: func
+    prange = range
 
-def analyze_receipt_correlation():
+# Load the data as parallel columns rather than a list of dicts; 32-bit
+# values are plenty for these magnitudes and halve the bytes per pass.
+# Money is kept as integer cents so sums and differences stay exact,
+# and is only divided back into dollars for display.
+days, miles, receipts, expected = load_cases()
+days = days.astype(np.int32)
+miles = miles.astype(np.float32)
+receipts = np.rint(receipts * 100).astype(np.int32)
+expected = np.rint(expected * 100).astype(np.int32)
+
+def derive_columns(days, miles, receipts, expected):
+    """Compute every per-case quantity the reports need in a single pass"""
+    base_est = expected - receipts  # cents, exact
+    
+    # Branch-free guarded divisions: divide by a safe stand-in everywhere,
+    # then select 0 where the real divisor is zero. Receipts are whole
+    # cents and days whole days, so 1 is a safe floor for both.
+    ratio = np.where(receipts > 0, expected / np.maximum(receipts, 1), 0.0)
+    per_day_base = np.where(days > 0, base_est / 100 / np.maximum(days, 1), 0.0)
+    mile_rate = np.where(miles > 0, base_est / 100 / np.where(miles > 0, miles, 1), 0.0)
+    
+    # One stable sort by receipts; the low and high buckets are then just
+    # the two ends of it, cut where the thresholds fall
+    order = np.argsort(receipts, kind='stable')
+    sorted_receipts = receipts[order]
+    low_cutoff = np.searchsorted(sorted_receipts, 30 * 100, side='left')
+    high_cutoff = np.searchsorted(sorted_receipts, 1000 * 100, side='right')
+    
+    return {
+        'days': days,
+        'miles': miles,
+        'receipts': receipts,
+        'expected': expected,
+        'ratio': ratio,
+        'base_est': base_est,
+        'per_day_base': per_day_base,
+        'mile_rate': mile_rate,
+        'low_idx': order[:low_cutoff],
+        'high_idx': order[high_cutoff:],
+    }
+
+# One row of the receipt/reimbursement ratio table; money in cents
+RATIO_ROW = np.dtype([
+    ('receipts', np.int32),
+    ('expected', np.int32),
+    ('ratio', np.float64),
+    ('days', np.int32),
+    ('miles', np.float32),
+])
+
+def analyze_receipt_correlation(cols):
     """Analyze the relationship between receipts and reimbursement"""
-    print("=== RECEIPT-BASED ANALYSIS ===")
-    
-    # Look at receipt-to-reimbursement ratios
-    ratios = []
-    for case in cases[:100]:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        reimbursement = case['expected_output']
-        
-        if receipts > 0:
-            ratio = reimbursement / receipts
-            ratios.append((receipts, reimbursement, ratio, days, miles))
-    
-    # Sort by receipt amount to see patterns
-    ratios.sort(key=lambda x: x[0])
-    
-    print("Receipt amount → Reimbursement (ratio, days, miles)")
-    for receipts, reimbursement, ratio, days, miles in ratios[:30]:
-        print(f"${receipts:.2f} → ${reimbursement:.2f} ({ratio:.2f}x, {days}d, {miles}mi)")
+    buf = io.StringIO()
+    w = buf.write
+    w("=== RECEIPT-BASED ANALYSIS ===\n")
+    days, miles, receipts, expected = cols['days'], cols['miles'], cols['receipts'], cols['expected']
+    
+    # Look at receipt-to-reimbursement ratios of the first 100 cases,
+    # sorted by receipt amount to see patterns
+    keep = np.flatnonzero(receipts[:100] > 0)
+    rows = np.empty(len(keep), dtype=RATIO_ROW)
+    rows['receipts'] = receipts[keep]
+    rows['expected'] = expected[keep]
+    rows['ratio'] = cols['ratio'][keep]
+    rows['days'] = days[keep]
+    rows['miles'] = miles[keep]
+    rows = rows[np.argsort(rows['receipts'], kind='stable')]
+    
+    w("Receipt amount → Reimbursement (ratio, days, miles)\n")
+    buf.writelines(f"${r / 100:.2f} → ${e / 100:.2f} ({q:.2f}x, {d}d, {m:g}mi)\n"
+                   for r, e, q, d, m in rows[:30])
+    
+    return buf.getvalue()
 
-def analyze_simple_receipt_cases():
+def analyze_simple_receipt_cases(cols):
     """Look at cases with minimal other factors"""
-    print("\n=== SIMPLE RECEIPT CASES ===")
+    buf = io.StringIO()
+    w = buf.write
+    w("\n=== SIMPLE RECEIPT CASES ===\n")
+    days, miles, receipts, expected = cols['days'], cols['miles'], cols['receipts'], cols['expected']
     
     # Cases with very low receipts - these should show base calculation
-    low_receipt_cases = []
-    for case in cases:
-        receipts = case['input']['total_receipts_amount']
-        if receipts < 30:
-            low_receipt_cases.append(case)
-    
-    low_receipt_cases.sort(key=lambda x: x['input']['total_receipts_amount'])
-    
-    print("Low receipt cases (under $30):")
-    for case in low_receipt_cases[:20]:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        reimbursement = case['expected_output']
-        
-        # Calculate what the reimbursement would be without receipts
-        base_estimate = reimbursement - receipts
-        per_day_base = base_estimate / days if days > 0 else 0
+    low_receipt_cases = cols['low_idx']
+    base_est, per_day = cols['base_est'], cols['per_day_base']
+    
+    w("Low receipt cases (under $30):\n")
+    for i in low_receipt_cases[:20]:
+        # What the reimbursement would be without receipts
+        base_estimate = base_est[i] / 100
+        per_day_base = per_day[i]
         
-        print(f"{days}d, {miles}mi, ${receipts:.2f} → ${reimbursement:.2f} (base ~${base_estimate:.2f}, ~${per_day_base:.2f}/day)")
+        w(f"{days[i]}d, {miles[i]:g}mi, ${receipts[i] / 100:.2f} → ${expected[i] / 100:.2f} (base ~${base_estimate:.2f}, ~${per_day_base:.2f}/day)\n")
+    
+    return buf.getvalue()
 
-def test_receipt_plus_mileage_hypothesis():
+def test_receipt_plus_mileage_hypothesis(cols):
     """Test if it's receipts + mileage calculation"""
-    print("\n=== RECEIPT + MILEAGE HYPOTHESIS ===")
-    
-    test_cases = cases[:30]
-    total_error = 0
-    
-    for case in test_cases:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        expected = case['expected_output']
-        
-        # Hypothesis: reimbursement = receipts + mileage_component
-        # Try to figure out mileage rate
-        mileage_component = expected - receipts
-        if miles > 0:
-            apparent_mile_rate = mileage_component / miles
-            print(f"{days}d, {miles}mi, ${receipts:.2f} → ${expected:.2f} (mileage: ${mileage_component:.2f}, ${apparent_mile_rate:.3f}/mi)")
+    buf = io.StringIO()
+    w = buf.write
+    w("\n=== RECEIPT + MILEAGE HYPOTHESIS ===\n")
+    days, miles, receipts, expected = cols['days'], cols['miles'], cols['receipts'], cols['expected']
+    
+    # Hypothesis: reimbursement = receipts + mileage_component
+    # Try to figure out mileage rate, for the test cases with any miles
+    n_test = 30
+    with_miles = np.flatnonzero(miles[:n_test] > 0)
+    mileage_component = cols['base_est'][with_miles] / 100
+    apparent_mile_rate = cols['mile_rate'][with_miles]
+    
+    buf.writelines(f"{days[i]}d, {miles[i]:g}mi, ${receipts[i] / 100:.2f} → ${expected[i] / 100:.2f} (mileage: ${m:.2f}, ${r:.3f}/mi)\n"
+                   for i, m, r in zip(with_miles, mileage_component, apparent_mile_rate))
+    
+    return buf.getvalue()
 
-def look_for_base_plus_receipts():
+# Compiled eagerly for the column types above, so the (disk-cached) kernel
+# is ready at import instead of stalling the first call
+@njit('float64[:, :](int32[:], int32[:], int32[:], float64[:], float64[:])',
+      parallel=True, cache=True, fastmath=True)
+def grid_search(days, receipts, expected, bases, mults):
+    """Mean absolute error of bases[i] * days + mults[j] * receipts for every (i, j)
+
+    receipts and expected are in cents, bases in dollars per day; the
+    errors come back in dollars.
+    """
+    err = np.empty((len(bases), len(mults)))
+    for bi in prange(len(bases)):
+        for mi in range(len(mults)):
+            # One vectorized row per (base, mult), so no (bases, mults, cases)
+            # temporary is built
+            predicted = bases[bi] * 100 * days + mults[mi] * receipts
+            err[bi, mi] = np.abs(predicted - expected).sum() / len(days) / 100
+    return err
+
+def look_for_base_plus_receipts(cols):
     """Test if it's base_per_day * days + receipt_multiplier * receipts"""
-    print("\n=== BASE + RECEIPT MULTIPLIER HYPOTHESIS ===")
+    buf = io.StringIO()
+    w = buf.write
+    w("\n=== BASE + RECEIPT MULTIPLIER HYPOTHESIS ===\n")
+    days, miles, receipts, expected = cols['days'], cols['miles'], cols['receipts'], cols['expected']
     
     # Try different base rates and receipt multipliers
-    base_rates = [50, 75, 100, 125, 150]
-    receipt_multipliers = [0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2]
-    
-    best_error = float('inf')
-    best_params = None
-    
-    for base_rate in base_rates:
-        for receipt_mult in receipt_multipliers:
-            total_error = 0
-            test_cases = cases[:50]
-            
-            for case in test_cases:
-                days = case['input']['trip_duration_days']
-                receipts = case['input']['total_receipts_amount']
-                expected = case['expected_output']
-                
-                predicted = base_rate * days + receipt_mult * receipts
-                error = abs(predicted - expected)
-                total_error += error
-            
-            avg_error = total_error / len(test_cases)
-            if avg_error < best_error:
-                best_error = avg_error
-                best_params = (base_rate, receipt_mult)
-    
-    print(f"Best simple formula: ${best_params[0]} * days + {best_params[1]} * receipts")
-    print(f"Average error: ${best_error:.2f}")
+    base_rates = np.array([50, 75, 100, 125, 150], dtype=np.float64)
+    receipt_multipliers = np.array([0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2])
+    
+    # Slice the test cases once, outside the search
+    n_test = 50
+    test_days, test_receipts, test_expected = days[:n_test], receipts[:n_test], expected[:n_test]
+    
+    # Errors for every (base_rate, receipt_mult) pair over the test cases
+    err = grid_search(test_days, test_receipts, test_expected, base_rates, receipt_multipliers)
+    
+    i, j = np.unravel_index(err.argmin(), err.shape)
+    best_error = err[i, j]
+    best_params = (int(base_rates[i]), float(receipt_multipliers[j]))
+    
+    w(f"Best simple formula: ${best_params[0]} * days + {best_params[1]} * receipts\n")
+    w(f"Average error: ${best_error:.2f}\n")
     
     # Test this formula on a few cases
     base_rate, receipt_mult = best_params
-    print(f"\nTesting formula: {base_rate} * days + {receipt_mult} * receipts")
+    w(f"\nTesting formula: {base_rate} * days + {receipt_mult} * receipts\n")
     
-    for case in cases[:10]:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        expected = case['expected_output']
-        
-        predicted = base_rate * days + receipt_mult * receipts
-        error = abs(predicted - expected)
-        
-        print(f"{days}d, {miles}mi, ${receipts:.2f} → Expected: ${expected:.2f}, Predicted: ${predicted:.2f}, Error: ${error:.2f}")
+    predicted = (base_rate * 100 * days[:10] + receipt_mult * receipts[:10]) / 100
+    errors = np.abs(predicted - expected[:10] / 100)
+    
+    for i, error in enumerate(errors):
+        w(f"{days[i]}d, {miles[i]:g}mi, ${receipts[i] / 100:.2f} → Expected: ${expected[i] / 100:.2f}, Predicted: ${predicted[i]:.2f}, Error: ${error:.2f}\n")
+    
+    return buf.getvalue()
 
-def analyze_high_receipt_cases():
+def analyze_high_receipt_cases(cols):
     """Look at cases with high receipts to understand caps/penalties"""
-    print("\n=== HIGH RECEIPT ANALYSIS ===")
-    
-    high_receipt_cases = []
-    for case in cases:
-        receipts = case['input']['total_receipts_amount']
-        if receipts > 1000:
-            high_receipt_cases.append(case)
-    
-    high_receipt_cases.sort(key=lambda x: x['input']['total_receipts_amount'])
-    
-    print("High receipt cases (over $1000):")
-    for case in high_receipt_cases[:15]:
-        days = case['input']['trip_duration_days']
-        miles = case['input']['miles_traveled']
-        receipts = case['input']['total_receipts_amount']
-        reimbursement = case['expected_output']
-        
-        ratio = reimbursement / receipts if receipts > 0 else 0
-        print(f"{days}d, {miles}mi, ${receipts:.2f} → ${reimbursement:.2f} (ratio: {ratio:.2f})")
+    buf = io.StringIO()
+    w = buf.write
+    w("\n=== HIGH RECEIPT ANALYSIS ===\n")
+    days, miles, receipts, expected = cols['days'], cols['miles'], cols['receipts'], cols['expected']
+    
+    high_receipt_cases = cols['high_idx']
+    
+    ratio = cols['ratio']
+    w("High receipt cases (over $1000):\n")
+    buf.writelines(f"{days[i]}d, {miles[i]:g}mi, ${receipts[i] / 100:.2f} → ${expected[i] / 100:.2f} (ratio: {ratio[i]:.2f})\n"
+                   for i in high_receipt_cases[:15])
+    
+    return buf.getvalue()
+
+REPORTS = (
+    analyze_receipt_correlation,
+    analyze_simple_receipt_cases,
+    test_receipt_plus_mileage_hypothesis,
+    look_for_base_plus_receipts,
+    analyze_high_receipt_cases,
+)
 
 if __name__ == "__main__":
-    analyze_receipt_correlation()
-    analyze_simple_receipt_cases()
-    test_receipt_plus_mileage_hypothesis()
-    look_for_base_plus_receipts()
-    analyze_high_receipt_cases() 
\ No newline at end of file
+    cols = derive_columns(days, miles, receipts, expected)
+    
+    for report in REPORTS:
+        sys.stdout.write(report(cols))